@@ -10,9 +10,19 @@ import streamlit as st
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
+from db_manager import init_db
 
 DB_PATH = Path(__file__).parent.parent / "data" / "risk_data.db"
 
+# How long cached query results stay valid between reruns (seconds)
+CACHE_TTL_SECONDS = 300
+
+# Date format written by all scrapers
+DATE_FORMAT = "%Y-%m-%d"
+
+# Rows per page in the Data Feed tables
+FEED_PAGE_SIZE = 100
+
 
 # =============================================================================
 # NAME NORMALIZATION FOR CROSS-REFERENCE MATCHING
@@ -108,78 +118,180 @@ def find_cross_reference_alerts(warn_df, legal_df):
 # DATABASE FUNCTIONS
 # =============================================================================
 
-def get_connection():
-    """Get a connection to the SQLite database."""
-    return sqlite3.connect(DB_PATH)
+@st.cache_resource
+def get_cached_conn():
+    """Get a process-wide SQLite connection shared across reruns and sessions."""
+    # Make sure indexes and summary tables exist before serving reads
+    init_db()
+    return sqlite3.connect(DB_PATH, check_same_thread=False)
 
 
-def load_loans():
-    """Load all BDC loans from the database."""
-    conn = get_connection()
-    df = pd.read_sql_query("SELECT * FROM bdc_loans", conn)
-    conn.close()
-    return df
+def fetch_frame(query, params=(), dtypes=None):
+    """Run a query and build a DataFrame directly from the fetched rows.
 
+    Skips pandas' read_sql machinery for plain scans.
 
-def load_warn_notices():
-    """Load all WARN notices from the database."""
-    conn = get_connection()
-    df = pd.read_sql_query("SELECT * FROM warn_notices", conn)
-    conn.close()
+    Args:
+        query: SQL query string.
+        params: Query parameters.
+        dtypes: Optional {column: dtype} mapping applied after loading.
+
+    Returns:
+        DataFrame with one column per selected field.
+    """
+    cursor = get_cached_conn().execute(query, params)
+    columns = [d[0] for d in cursor.description]
+    df = pd.DataFrame.from_records(cursor.fetchall(), columns=columns)
+    if dtypes:
+        df = df.astype(dtypes)
     return df
 
 
-def load_legal_cases():
-    """Load all legal cases from the database."""
-    conn = get_connection()
-    df = pd.read_sql_query("SELECT * FROM legal_cases", conn)
-    conn.close()
+def paginate(query, page):
+    """Append newest-first LIMIT/OFFSET paging to a single-table query.
+
+    Args:
+        query: SELECT over one table with an id column.
+        page: 1-based page number, or None for all rows.
+
+    Returns:
+        Tuple of (query, params).
+    """
+    if page is None:
+        return query, ()
+    return (
+        query + " ORDER BY id DESC LIMIT ? OFFSET ?",
+        (FEED_PAGE_SIZE, (page - 1) * FEED_PAGE_SIZE)
+    )
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def load_loans(page=None):
+    """Load BDC loans from the database, or one Data Feed page of them."""
+    query, params = paginate("""
+        SELECT borrower, fund, sector, cost, fair_value, date_added
+        FROM bdc_loans
+    """, page)
+    return fetch_frame(query, params, dtypes={"cost": "float64", "fair_value": "float64"})
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def load_loans_trend_cols():
+    """Load only the columns the trend charts need from bdc_loans."""
+    return fetch_frame("""
+        SELECT fund, date_added, fair_value
+        FROM bdc_loans
+    """, dtypes={"fair_value": "float64"})
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def load_fund_trend(fund):
+    """Load the dated fair_value series for a single fund, oldest first.
+
+    Args:
+        fund: Fund name as stored in bdc_loans.fund.
+
+    Returns:
+        DataFrame with date_added (datetime) and fair_value columns.
+    """
+    conn = get_cached_conn()
+    df = pd.read_sql_query("""
+        SELECT date_added, fair_value
+        FROM bdc_loans
+        WHERE fund = ?
+        ORDER BY date_added
+    """, conn, params=(fund,), parse_dates={"date_added": DATE_FORMAT})
     return df
 
 
-def get_distressed_loans_count():
-    """Count loans where fair_value < cost (distressed)."""
-    conn = get_connection()
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def get_fund_trend_endpoints(fund):
+    """Get the point count and the first/latest fair_value for a fund.
+
+    Args:
+        fund: Fund name as stored in bdc_loans.fund.
+
+    Returns:
+        Tuple of (num_points, start_value, latest_value).
+    """
+    conn = get_cached_conn()
     cursor = conn.cursor()
     cursor.execute("""
-        SELECT COUNT(*) FROM bdc_loans
-        WHERE fair_value < cost
-    """)
-    count = cursor.fetchone()[0]
-    conn.close()
-    return count
+        SELECT
+            (SELECT COUNT(*) FROM bdc_loans WHERE fund = :fund),
+            (SELECT fair_value FROM bdc_loans WHERE fund = :fund
+             ORDER BY date_added, id LIMIT 1),
+            (SELECT fair_value FROM bdc_loans WHERE fund = :fund
+             ORDER BY date_added DESC, id DESC LIMIT 1)
+    """, {"fund": fund})
+    return cursor.fetchone()
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def load_warn_notices(page=None):
+    """Load WARN notices from the database, or one Data Feed page of them."""
+    query, params = paginate("""
+        SELECT company, state, employees, date_filed
+        FROM warn_notices
+    """, page)
+    return fetch_frame(query, params, dtypes={"employees": "Int64"})
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def load_legal_cases(page=None):
+    """Load legal cases from the database, or one Data Feed page of them."""
+    query, params = paginate("""
+        SELECT defendant, plaintiff, court, case_type, date_filed
+        FROM legal_cases
+    """, page)
+    return fetch_frame(query, params)
+
 
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def get_feed_counts():
+    """Row counts for the Data Feed tables in a single query.
 
-def get_total_layoffs():
-    """Sum of all employees affected by WARN notices."""
-    conn = get_connection()
+    Returns:
+        Tuple of (loan count, WARN notice count, legal case count).
+    """
+    conn = get_cached_conn()
     cursor = conn.cursor()
-    cursor.execute("SELECT COALESCE(SUM(employees), 0) FROM warn_notices")
-    total = cursor.fetchone()[0]
-    conn.close()
-    return total
+    cursor.execute("""
+        SELECT
+            (SELECT COUNT(*) FROM bdc_loans),
+            (SELECT COUNT(*) FROM warn_notices),
+            (SELECT COUNT(*) FROM legal_cases)
+    """)
+    return cursor.fetchone()
 
 
-def get_legal_cases_count():
-    """Count of legal cases in the database."""
-    conn = get_connection()
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def get_headline_metrics():
+    """Compute the Key Risk Indicators in a single query.
+
+    Returns:
+        Tuple of (distressed loan count, total layoffs, legal case count).
+    """
+    conn = get_cached_conn()
     cursor = conn.cursor()
-    cursor.execute("SELECT COUNT(*) FROM legal_cases")
-    count = cursor.fetchone()[0]
-    conn.close()
-    return count
+    cursor.execute("""
+        SELECT
+            (SELECT COUNT(*) FROM bdc_loans WHERE fair_value < cost),
+            (SELECT COALESCE(SUM(employees), 0) FROM warn_notices),
+            (SELECT COUNT(*) FROM legal_cases)
+    """)
+    return cursor.fetchone()
 
 
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
 def get_layoffs_by_state():
-    """Get layoff totals grouped by state."""
-    conn = get_connection()
+    """Get layoff totals by state from the warn_by_state summary table."""
+    conn = get_cached_conn()
     df = pd.read_sql_query("""
-        SELECT state, SUM(employees) as total_employees
-        FROM warn_notices
-        GROUP BY state
+        SELECT state, total_employees
+        FROM warn_by_state
         ORDER BY total_employees DESC
     """, conn)
-    conn.close()
     return df
 
 
@@ -205,6 +317,23 @@ def refresh_data():
     return bdc_count, warn_count, legal_count
 
 
+def feed_page_selector(total, key):
+    """Render a page picker for a Data Feed table.
+
+    Args:
+        total: Total rows in the table.
+        key: Widget key, unique per tab.
+
+    Returns:
+        Tuple of (page, first_row, last_row) with 1-based row numbers.
+    """
+    num_pages = max(1, -(-total // FEED_PAGE_SIZE))
+    page = st.number_input("Page", min_value=1, max_value=num_pages, step=1, key=key)
+    first_row = (page - 1) * FEED_PAGE_SIZE + 1
+    last_row = min(page * FEED_PAGE_SIZE, total)
+    return page, first_row, last_row
+
+
 # =============================================================================
 # STREAMLIT APP
 # =============================================================================
@@ -245,6 +374,8 @@ col_refresh, col_spacer = st.columns([1, 5])
 with col_refresh:
     if st.button("Refresh Data", type="primary"):
         bdc_count, warn_count, legal_count = refresh_data()
+        # Scrapers just wrote new rows - drop memoized query results
+        st.cache_data.clear()
         st.success(f"Refreshed: {bdc_count} BDC records, {warn_count} WARN notices, {legal_count} legal cases")
         st.rerun()
 
@@ -253,8 +384,9 @@ st.subheader("Key Risk Indicators")
 
 col1, col2, col3 = st.columns(3)
 
+distressed, layoffs, lawsuits = get_headline_metrics()
+
 with col1:
-    distressed = get_distressed_loans_count()
     st.metric(
         label="Distressed Loans",
         value=distressed,
@@ -262,7 +394,6 @@ with col1:
     )
 
 with col2:
-    layoffs = get_total_layoffs()
     st.metric(
         label="Total Layoffs",
         value=f"{layoffs:,}",
@@ -270,7 +401,6 @@ with col2:
     )
 
 with col3:
-    lawsuits = get_legal_cases_count()
     st.metric(
         label="New Lawsuits",
         value=lawsuits,
@@ -281,8 +411,8 @@ with col3:
 st.markdown("---")
 st.markdown("#### Credit Stress Velocity")
 
-# Load BDC data
-loans_df_full = load_loans()
+# Load BDC trend columns
+loans_df_full = load_loans_trend_cols()
 
 if not loans_df_full.empty:
     # Fund selector
@@ -293,37 +423,34 @@ if not loans_df_full.empty:
         index=0
     )
 
-    # Filter data for selected fund
-    fund_df = loans_df_full[loans_df_full["fund"] == selected_fund].copy()
+    # Trend annotation only needs the first and latest points
+    num_points, start_value, latest_value = get_fund_trend_endpoints(selected_fund)
 
-    if not fund_df.empty and len(fund_df) > 1:
-        # Sort by date and ensure fair_value is numeric
-        fund_df["date_added"] = pd.to_datetime(fund_df["date_added"])
-        fund_df["fair_value"] = pd.to_numeric(fund_df["fair_value"], errors="coerce")
-        fund_df = fund_df.sort_values("date_added")
+    if num_points > 1:
+        # The full series is only loaded when the chart is switched on
+        if st.toggle("Show trend chart", key="show_trend_chart"):
+            # Filtered and sorted by SQLite (idx_bdc_fund_date)
+            fund_df = load_fund_trend(selected_fund)
+            fund_df["fair_value"] = pd.to_numeric(fund_df["fair_value"], errors="coerce")
 
-        # Create chart data
-        chart_data = fund_df.set_index("date_added")[["fair_value"]].rename(
-            columns={"fair_value": "Distress Score (Non-Accrual Count)"}
-        )
+            # Create chart data
+            chart_data = fund_df.set_index("date_added")[["fair_value"]].rename(
+                columns={"fair_value": "Distress Score (Non-Accrual Count)"}
+            )
 
-        st.line_chart(chart_data)
+            st.line_chart(chart_data)
 
-        # Calculate trend for annotation
-        start_value = fund_df["fair_value"].iloc[0]
-        latest_value = fund_df["fair_value"].iloc[-1]
-
-        if start_value > 0:
+        if start_value is not None and latest_value is not None and start_value > 0:
             pct_change = ((latest_value - start_value) / start_value) * 100
 
             if latest_value > start_value:
-                st.warning(f"Trend Alert: {selected_fund} credit stress has increased by {pct_change:.1f}% over the last {len(fund_df)} quarters.")
+                st.warning(f"Trend Alert: {selected_fund} credit stress has increased by {pct_change:.1f}% over the last {num_points} quarters.")
             else:
                 st.success(f"Trend Alert: {selected_fund} credit stress is stable or improving.")
         else:
             st.info(f"Trend Alert: {selected_fund} baseline data unavailable for comparison.")
-    elif not fund_df.empty:
-        st.info(f"Only {len(fund_df)} data point(s) available for {selected_fund}. Need at least 2 quarters for trend analysis.")
+    elif num_points:
+        st.info(f"Only {num_points} data point(s) available for {selected_fund}. Need at least 2 quarters for trend analysis.")
     else:
         st.info(f"No trend data available for {selected_fund}.")
 
@@ -331,7 +458,7 @@ if not loans_df_full.empty:
     st.markdown("##### Sector Comparison (All Funds)")
 
     # Prepare data for multi-fund comparison
-    loans_df_full["date_added"] = pd.to_datetime(loans_df_full["date_added"])
+    loans_df_full["date_added"] = pd.to_datetime(loans_df_full["date_added"], format=DATE_FORMAT)
     loans_df_full["fair_value"] = pd.to_numeric(loans_df_full["fair_value"], errors="coerce")
 
     # Pivot to get funds as columns
@@ -375,35 +502,52 @@ st.divider()
 # Data Feed Section
 st.subheader("Data Feed")
 
-tab_loans, tab_warn, tab_legal = st.tabs(["📊 BDC Loans", "⚠️ WARN Notices", "⚖️ Legal Cases"])
+# Tab state is tracked so only the selected tab's query and table run
+tab_loans, tab_warn, tab_legal = st.tabs(
+    ["📊 BDC Loans", "⚠️ WARN Notices", "⚖️ Legal Cases"],
+    key="data_feed_tab",
+    on_change="rerun"
+)
+
+loans_total, warn_total, legal_total = get_feed_counts()
 
 with tab_loans:
-    loans_df = load_loans()
-    if not loans_df.empty:
-        # Format currency columns
-        loans_display = loans_df.copy()
-        loans_display["cost"] = loans_display["cost"].apply(lambda x: f"${x:,.2f}")
-        loans_display["fair_value"] = loans_display["fair_value"].apply(lambda x: f"${x:,.2f}")
-        st.dataframe(loans_display, hide_index=True)
-        st.caption(f"Total records: {len(loans_df)}")
-    else:
-        st.info("No loan data available.")
+    if tab_loans.open:
+        if loans_total:
+            page, first_row, last_row = feed_page_selector(loans_total, "loans_page")
+            loans_df = load_loans(page)
+            # Currency is formatted in the browser; only float64 values are sent
+            st.dataframe(
+                loans_df,
+                hide_index=True,
+                column_config={
+                    "cost": st.column_config.NumberColumn(format="dollar"),
+                    "fair_value": st.column_config.NumberColumn(format="dollar"),
+                }
+            )
+            st.caption(f"Showing {first_row}-{last_row} of {loans_total} records")
+        else:
+            st.info("No loan data available.")
 
 with tab_warn:
-    warn_df = load_warn_notices()
-    if not warn_df.empty:
-        st.dataframe(warn_df, hide_index=True)
-        st.caption(f"Total records: {len(warn_df)}")
-    else:
-        st.info("No WARN notice data available.")
+    if tab_warn.open:
+        if warn_total:
+            page, first_row, last_row = feed_page_selector(warn_total, "warn_page")
+            warn_df = load_warn_notices(page)
+            st.dataframe(warn_df, hide_index=True)
+            st.caption(f"Showing {first_row}-{last_row} of {warn_total} records")
+        else:
+            st.info("No WARN notice data available.")
 
 with tab_legal:
-    legal_df = load_legal_cases()
-    if not legal_df.empty:
-        st.dataframe(legal_df, hide_index=True)
-        st.caption(f"Total records: {len(legal_df)}")
-    else:
-        st.info("No legal case data available.")
+    if tab_legal.open:
+        if legal_total:
+            page, first_row, last_row = feed_page_selector(legal_total, "legal_page")
+            legal_df = load_legal_cases(page)
+            st.dataframe(legal_df, hide_index=True)
+            st.caption(f"Showing {first_row}-{last_row} of {legal_total} records")
+        else:
+            st.info("No legal case data available.")
 
 # Footer
 st.divider()
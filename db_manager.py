@@ -5,12 +5,20 @@ from pathlib import Path
 
 DB_PATH = Path(__file__).parent / "data" / "risk_data.db"
 
+# Insertable columns per table, in insert order
+LOAN_COLUMNS = ("borrower", "fund", "sector", "cost", "fair_value", "date_added")
+WARN_COLUMNS = ("company", "state", "employees", "date_filed")
+LEGAL_COLUMNS = ("defendant", "plaintiff", "court", "case_type", "date_filed")
+
 
 def get_connection():
     """Get a connection to the SQLite database."""
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
+    # Safe with WAL: only the last commits can be lost on power failure
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
     return conn
 
 
@@ -19,6 +27,9 @@ def init_db():
     conn = get_connection()
     cursor = conn.cursor()
 
+    # WAL is persistent in the file header; commits no longer rewrite a rollback journal
+    cursor.execute("PRAGMA journal_mode=WAL")
+
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS bdc_loans (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -32,6 +43,18 @@ def init_db():
         )
     """)
 
+    # Per-fund trend lookups on the dashboard filter by fund, ordered by date
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_bdc_fund_date
+        ON bdc_loans(fund, date_added)
+    """)
+
+    # Daily report pulls each table by its date column
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_bdc_date_added
+        ON bdc_loans(date_added)
+    """)
+
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS warn_notices (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -43,6 +66,77 @@ def init_db():
         )
     """)
 
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_warn_date_filed
+        ON warn_notices(date_filed)
+    """)
+
+    # Duplicate checks group by company + date; the UNIQUE key has state in between
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_warn_company_date
+        ON warn_notices(company, date_filed)
+    """)
+
+    # Per-state layoff totals, kept current by triggers so reads never aggregate
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS warn_by_state (
+            state TEXT PRIMARY KEY,
+            total_employees INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+
+    # Triggers only fire for rows actually inserted, so ignored duplicates don't count
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_warn_by_state_insert
+        AFTER INSERT ON warn_notices
+        WHEN NEW.state IS NOT NULL
+        BEGIN
+            INSERT INTO warn_by_state (state, total_employees)
+            VALUES (NEW.state, COALESCE(NEW.employees, 0))
+            ON CONFLICT(state) DO UPDATE
+            SET total_employees = total_employees + excluded.total_employees;
+        END
+    """)
+
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_warn_by_state_delete
+        AFTER DELETE ON warn_notices
+        WHEN OLD.state IS NOT NULL
+        BEGIN
+            UPDATE warn_by_state
+            SET total_employees = total_employees - COALESCE(OLD.employees, 0)
+            WHERE state = OLD.state;
+        END
+    """)
+
+    # Move a row's employees from its old state total to its new one
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_warn_by_state_update
+        AFTER UPDATE OF state, employees ON warn_notices
+        BEGIN
+            UPDATE warn_by_state
+            SET total_employees = total_employees - COALESCE(OLD.employees, 0)
+            WHERE state = OLD.state;
+
+            INSERT INTO warn_by_state (state, total_employees)
+            SELECT NEW.state, COALESCE(NEW.employees, 0)
+            WHERE NEW.state IS NOT NULL
+            ON CONFLICT(state) DO UPDATE
+            SET total_employees = total_employees + excluded.total_employees;
+        END
+    """)
+
+    # Backfill once for databases created before the summary table existed
+    cursor.execute("SELECT COUNT(*) FROM warn_by_state")
+    if cursor.fetchone()[0] == 0:
+        cursor.execute("""
+            INSERT INTO warn_by_state (state, total_employees)
+            SELECT state, COALESCE(SUM(employees), 0)
+            FROM warn_notices
+            WHERE state IS NOT NULL
+            GROUP BY state
+        """)
+
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS legal_cases (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -55,6 +149,26 @@ def init_db():
         )
     """)
 
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_legal_date_filed
+        ON legal_cases(date_filed)
+    """)
+
+    # Duplicate checks group by defendant + date; the UNIQUE key has plaintiff in between
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_legal_defendant_date
+        ON legal_cases(defendant, date_filed)
+    """)
+
+    # HTTP cache validators per source URL, for conditional GETs across runs
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS http_validators (
+            url TEXT PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT
+        )
+    """)
+
     conn.commit()
     conn.close()
 
@@ -137,6 +251,104 @@ def save_legal(data):
     return cursor.lastrowid
 
 
+def insert_many(table, columns, rows):
+    """Insert many records into a table in one transaction, ignoring duplicates.
+
+    Rows are streamed into executemany, so any iterable of dicts works
+    (a list, a generator, or DataFrame.to_dict("records")).
+
+    Args:
+        table: Table name.
+        columns: Column names to insert, in order.
+        rows: iterable of dicts keyed by column name; missing keys insert NULL.
+
+    Returns:
+        Number of rows actually inserted.
+    """
+    conn = get_connection()
+    placeholders = ", ".join("?" * len(columns))
+    cursor = conn.executemany(
+        f"INSERT OR IGNORE INTO {table} ({', '.join(columns)}) VALUES ({placeholders})",
+        (tuple(data.get(col) for col in columns) for data in rows)
+    )
+
+    conn.commit()
+    conn.close()
+    return cursor.rowcount
+
+
+def save_loans_bulk(rows):
+    """Insert many loan records in a single transaction, ignoring duplicates.
+
+    Args:
+        rows: iterable of dicts with the same keys as save_loan.
+
+    Returns:
+        Number of rows actually inserted.
+    """
+    return insert_many("bdc_loans", LOAN_COLUMNS, rows)
+
+
+def save_warns_bulk(rows):
+    """Insert many WARN notice records in a single transaction, ignoring duplicates.
+
+    Args:
+        rows: iterable of dicts with the same keys as save_warn.
+
+    Returns:
+        Number of rows actually inserted.
+    """
+    return insert_many("warn_notices", WARN_COLUMNS, rows)
+
+
+def save_legal_bulk(rows):
+    """Insert many legal case records in a single transaction, ignoring duplicates.
+
+    Args:
+        rows: iterable of dicts with the same keys as save_legal.
+
+    Returns:
+        Number of rows actually inserted.
+    """
+    return insert_many("legal_cases", LEGAL_COLUMNS, rows)
+
+
+def get_http_validators(url):
+    """Get the stored HTTP cache validators for a URL.
+
+    Args:
+        url: Source URL.
+
+    Returns:
+        Tuple of (etag, last_modified); each is None if not stored.
+    """
+    conn = get_connection()
+    row = conn.execute(
+        "SELECT etag, last_modified FROM http_validators WHERE url = ?", (url,)
+    ).fetchone()
+    conn.close()
+    return (row["etag"], row["last_modified"]) if row else (None, None)
+
+
+def save_http_validators(url, etag, last_modified):
+    """Store the HTTP cache validators returned for a URL.
+
+    Args:
+        url: Source URL.
+        etag: ETag response header, or None.
+        last_modified: Last-Modified response header, or None.
+    """
+    conn = get_connection()
+    conn.execute("""
+        INSERT INTO http_validators (url, etag, last_modified)
+        VALUES (?, ?, ?)
+        ON CONFLICT(url) DO UPDATE
+        SET etag = excluded.etag, last_modified = excluded.last_modified
+    """, (url, etag, last_modified))
+    conn.commit()
+    conn.close()
+
+
 if __name__ == "__main__":
     init_db()
     print(f"Database initialized at {DB_PATH}")
@@ -1,8 +1,10 @@
 """Generate daily newsletter for Shadow Bank Risk Observatory."""
 
+import json
 import sqlite3
 import sys
 from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
 
 # Fix Windows console encoding for emojis
@@ -18,49 +20,138 @@ def get_connection():
     return sqlite3.connect(DB_PATH)
 
 
-def get_todays_loans():
-    """Get all BDC loans added today."""
-    today = datetime.now().strftime("%Y-%m-%d")
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT borrower, fund, sector, cost, fair_value
-        FROM bdc_loans
-        WHERE date_added = ?
-    """, (today,))
-    rows = cursor.fetchall()
-    conn.close()
-    return rows
-
-
-def get_todays_warns():
-    """Get all WARN notices filed today."""
-    today = datetime.now().strftime("%Y-%m-%d")
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT company, state, employees
-        FROM warn_notices
-        WHERE date_filed = ?
-    """, (today,))
-    rows = cursor.fetchall()
-    conn.close()
-    return rows
-
-
-def get_todays_legal():
-    """Get all legal cases filed today."""
-    today = datetime.now().strftime("%Y-%m-%d")
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT defendant, plaintiff, court, case_type
-        FROM legal_cases
-        WHERE date_filed = ?
-    """, (today,))
-    rows = cursor.fetchall()
-    conn.close()
-    return rows
+def largest_layoff_first(notice):
+    """Sort key for WARN notices: most employees first, NULL counts last, then by id."""
+    employees = notice["employees"]
+    return (employees is None, -(employees or 0), notice["id"])
+
+
+def get_todays_all(conn, today):
+    """Get today's BDC loans, WARN notices and legal cases, grouped by SQLite.
+
+    Each group's rows are packed into a JSON array with json_group_array,
+    so no grouping happens in Python. SQLite does not guarantee the order
+    of rows inside a group, so each decoded group is sorted here.
+
+    Args:
+        conn: Open SQLite connection.
+        today: Date string in YYYY-MM-DD format.
+
+    Returns:
+        Tuple of (loans_by_sector, warns_by_state, legal_by_type):
+        - loans_by_sector: [(sector, [loan dicts])] ordered by sector
+        - warns_by_state: [(state, state_total, [notice dicts])], largest first
+        - legal_by_type: [(case_type, [case dicts])] ordered by case type
+    """
+    loans_by_sector = [
+        (sector, sorted(json.loads(loans), key=itemgetter("id")))
+        for sector, loans in conn.execute("""
+            SELECT sector,
+                   json_group_array(json_object(
+                       'id', id, 'borrower', borrower, 'fund', fund,
+                       'cost', cost, 'fair_value', fair_value))
+            FROM bdc_loans
+            WHERE date_added = ?
+            GROUP BY sector
+            ORDER BY sector
+        """, (today,))
+    ]
+
+    warns_by_state = [
+        (state, state_total, sorted(json.loads(notices), key=largest_layoff_first))
+        for state, state_total, notices in conn.execute("""
+            SELECT state, SUM(employees) AS state_total,
+                   json_group_array(json_object(
+                       'id', id, 'company', company, 'employees', employees))
+            FROM warn_notices
+            WHERE date_filed = ?
+            GROUP BY state
+            ORDER BY state_total DESC, state
+        """, (today,))
+    ]
+
+    legal_by_type = [
+        (case_type, sorted(json.loads(cases), key=itemgetter("id")))
+        for case_type, cases in conn.execute("""
+            SELECT case_type,
+                   json_group_array(json_object(
+                       'id', id, 'defendant', defendant, 'plaintiff', plaintiff,
+                       'court', court))
+            FROM legal_cases
+            WHERE date_filed = ?
+            GROUP BY case_type
+            ORDER BY case_type
+        """, (today,))
+    ]
+
+    return loans_by_sector, warns_by_state, legal_by_type
+
+
+def get_todays_summary(conn, today):
+    """Compute the executive summary figures for today in one query.
+
+    Args:
+        conn: Open SQLite connection.
+        today: Date string in YYYY-MM-DD format.
+
+    Returns:
+        Tuple of (distressed loan count, total impairment, WARN notice count,
+        total layoffs, legal case count).
+    """
+    return conn.execute("""
+        SELECT
+            (SELECT COUNT(*) FROM bdc_loans
+             WHERE date_added = :today AND fair_value < cost),
+            (SELECT COALESCE(SUM(cost - fair_value), 0) FROM bdc_loans
+             WHERE date_added = :today AND fair_value < cost),
+            (SELECT COUNT(*) FROM warn_notices
+             WHERE date_filed = :today),
+            (SELECT COALESCE(SUM(employees), 0) FROM warn_notices
+             WHERE date_filed = :today),
+            (SELECT COUNT(*) FROM legal_cases
+             WHERE date_filed = :today)
+    """, {"today": today}).fetchone()
+
+
+# ============================================================================
+# Report templates
+# ============================================================================
+
+SECTION_BREAK = "---\n\n"
+
+HEADER_TEMPLATE = """\
+# 🏦 Shadow Bank Risk Observatory
+## Daily Risk Report — {today}
+
+---
+
+## 📊 Executive Summary
+
+- **Distressed Loans Tracked:** {distressed_count}
+- **Total Impairment:** {total_impairment}
+- **Layoff Notices:** {warn_count} companies ({total_layoffs:,} employees)
+- **New Legal Cases:** {legal_count}
+
+---
+
+"""
+
+LOAN_TEMPLATE = """\
+- {status} **{borrower}** ({fund})
+  - Cost: {cost} → Fair Value: {fair_value} ({change_pct:+.1f}%)
+"""
+
+WARN_TEMPLATE = "- ⚠️ **{company}** — {employees:,} employees\n"
+
+LEGAL_TEMPLATE = """\
+- 📋 **{plaintiff}** v. **{defendant}**
+  - Court: {court}
+"""
+
+FOOTER = """\
+*This report is auto-generated by Shadow Bank Risk Observatory.*
+
+*Data sources: SEC EDGAR, State WARN databases, Court records*"""
 
 
 def format_currency(value):
@@ -72,131 +163,87 @@ def format_currency(value):
     return f"${value:,.0f}"
 
 
-def generate_newsletter():
-    """Generate the daily newsletter in Markdown format."""
-    today = datetime.now().strftime("%B %d, %Y")
-
-    loans = get_todays_loans()
-    warns = get_todays_warns()
-    legal = get_todays_legal()
-
-    # Calculate summary stats
-    total_layoffs = sum(w[2] for w in warns) if warns else 0
-    distressed_loans = [l for l in loans if l[4] < l[3]]  # fair_value < cost
-    total_distressed_value = sum(l[3] - l[4] for l in distressed_loans)
-
-    # Build the newsletter
-    lines = []
-
-    # Header
-    lines.append(f"# 🏦 Shadow Bank Risk Observatory")
-    lines.append(f"## Daily Risk Report — {today}")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
-
-    # Executive Summary
-    lines.append("## 📊 Executive Summary")
-    lines.append("")
-    lines.append(f"- **Distressed Loans Tracked:** {len(distressed_loans)}")
-    lines.append(f"- **Total Impairment:** {format_currency(total_distressed_value)}")
-    lines.append(f"- **Layoff Notices:** {len(warns)} companies ({total_layoffs:,} employees)")
-    lines.append(f"- **New Legal Cases:** {len(legal)}")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
+def generate_newsletter(conn):
+    """Generate the daily newsletter in Markdown format.
+
+    The fixed parts of the report are module-level block templates, so each
+    section is emitted with a few str.format calls and the whole report is
+    assembled with a single join.
+
+    Args:
+        conn: Open SQLite connection shared by all report queries.
+    """
+    now = datetime.now()
+    report_date = now.strftime("%Y-%m-%d")
+
+    loans_by_sector, warns_by_state, legal_by_type = get_todays_all(conn, report_date)
+
+    # Summary stats are aggregated by SQLite (distressed: fair_value < cost)
+    (distressed_count, total_distressed_value, warn_count,
+     total_layoffs, legal_count) = get_todays_summary(conn, report_date)
+
+    parts = [HEADER_TEMPLATE.format(
+        today=now.strftime("%B %d, %Y"),
+        distressed_count=distressed_count,
+        total_impairment=format_currency(total_distressed_value),
+        warn_count=warn_count,
+        total_layoffs=total_layoffs,
+        legal_count=legal_count,
+    )]
 
     # BDC Loans Section
-    lines.append("## 📉 BDC Portfolio Alerts")
-    lines.append("")
-    if loans:
-        # Group by sector
-        sectors = {}
-        for borrower, fund, sector, cost, fair_value in loans:
-            if sector not in sectors:
-                sectors[sector] = []
-            sectors[sector].append((borrower, fund, cost, fair_value))
-
-        for sector, sector_loans in sectors.items():
-            lines.append(f"### {sector}")
-            lines.append("")
-            for borrower, fund, cost, fair_value in sector_loans:
-                change = fair_value - cost
-                change_pct = (change / cost) * 100 if cost else 0
-                status = "🔴" if change < 0 else "🟢"
-                lines.append(f"- {status} **{borrower}** ({fund})")
-                lines.append(f"  - Cost: {format_currency(cost)} → Fair Value: {format_currency(fair_value)} ({change_pct:+.1f}%)")
-            lines.append("")
-    else:
-        lines.append("*No new loan data recorded today.*")
-        lines.append("")
-
-    lines.append("---")
-    lines.append("")
+    parts.append("## 📉 BDC Portfolio Alerts\n\n")
+    for sector, sector_loans in loans_by_sector:
+        parts.append(f"### {sector}\n\n")
+        for loan in sector_loans:
+            cost, fair_value = loan["cost"], loan["fair_value"]
+            change = fair_value - cost
+            parts.append(LOAN_TEMPLATE.format(
+                status="🔴" if change < 0 else "🟢",
+                borrower=loan["borrower"],
+                fund=loan["fund"],
+                cost=format_currency(cost),
+                fair_value=format_currency(fair_value),
+                change_pct=(change / cost) * 100 if cost else 0,
+            ))
+        parts.append("\n")
+    if not loans_by_sector:
+        parts.append("*No new loan data recorded today.*\n\n")
+    parts.append(SECTION_BREAK)
 
     # WARN Notices Section
-    lines.append("## 🚨 WARN Act Layoff Notices")
-    lines.append("")
-    if warns:
-        # Group by state
-        states = {}
-        for company, state, employees in warns:
-            if state not in states:
-                states[state] = []
-            states[state].append((company, employees))
-
-        for state, state_warns in sorted(states.items(), key=lambda x: -sum(w[1] for w in x[1])):
-            state_total = sum(w[1] for w in state_warns)
-            lines.append(f"### {state} ({state_total:,} employees)")
-            lines.append("")
-            for company, employees in state_warns:
-                lines.append(f"- ⚠️ **{company}** — {employees:,} employees")
-            lines.append("")
-    else:
-        lines.append("*No WARN notices filed today.*")
-        lines.append("")
-
-    lines.append("---")
-    lines.append("")
+    parts.append("## 🚨 WARN Act Layoff Notices\n\n")
+    for state, state_total, state_warns in warns_by_state:
+        parts.append(f"### {state} ({state_total:,} employees)\n\n")
+        parts.extend(WARN_TEMPLATE.format_map(notice) for notice in state_warns)
+        parts.append("\n")
+    if not warns_by_state:
+        parts.append("*No WARN notices filed today.*\n\n")
+    parts.append(SECTION_BREAK)
 
     # Legal Cases Section
-    lines.append("## ⚖️ Legal & Litigation Watch")
-    lines.append("")
-    if legal:
-        # Group by case type
-        case_types = {}
-        for defendant, plaintiff, court, case_type in legal:
-            if case_type not in case_types:
-                case_types[case_type] = []
-            case_types[case_type].append((defendant, plaintiff, court))
-
-        for case_type, cases in case_types.items():
-            lines.append(f"### {case_type or 'General'}")
-            lines.append("")
-            for defendant, plaintiff, court in cases:
-                lines.append(f"- 📋 **{plaintiff}** v. **{defendant}**")
-                lines.append(f"  - Court: {court}")
-            lines.append("")
-    else:
-        lines.append("*No new legal cases filed today.*")
-        lines.append("")
-
-    lines.append("---")
-    lines.append("")
-
-    # Footer
-    lines.append("*This report is auto-generated by Shadow Bank Risk Observatory.*")
-    lines.append("")
-    lines.append("*Data sources: SEC EDGAR, State WARN databases, Court records*")
-
-    return "\n".join(lines)
+    parts.append("## ⚖️ Legal & Litigation Watch\n\n")
+    for case_type, cases in legal_by_type:
+        parts.append(f"### {case_type or 'General'}\n\n")
+        parts.extend(LEGAL_TEMPLATE.format_map(case) for case in cases)
+        parts.append("\n")
+    if not legal_by_type:
+        parts.append("*No new legal cases filed today.*\n\n")
+    parts.append(SECTION_BREAK)
+
+    parts.append(FOOTER)
+    return "".join(parts)
 
 
 def main():
     """Generate and save the daily newsletter."""
     print("Generating daily newsletter...\n")
 
-    newsletter = generate_newsletter()
+    conn = get_connection()
+    try:
+        newsletter = generate_newsletter(conn)
+    finally:
+        conn.close()
 
     # Save to file
     with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
@@ -1,19 +1,28 @@
 """BDC Scraper for SEC 10-Q filings - Multi-Fund Trend Analysis."""
 
+import hashlib
+import json
 import logging
+import mmap
+import multiprocessing
+import os
 import re
+import shutil
 import sys
+import threading
 import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache, partial
 from pathlib import Path
+from statistics import fmean
 
-from bs4 import BeautifulSoup
-from sec_edgar_downloader import Downloader
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from db_manager import init_db, save_loan
+from db_manager import init_db, save_loans_bulk
 
 # Configure logging to file
 LOG_PATH = Path(__file__).parent.parent / "scraping_log.txt"
@@ -28,27 +37,200 @@ logger = logging.getLogger(__name__)
 # BDC UNIVERSE - Top 5 BDCs by Market Cap/AUM (~$100B+ total assets)
 # =============================================================================
 
+BDC = namedtuple("BDC", ["ticker", "name"])
+
+# One row of the end-of-run summary
+BDCResult = namedtuple("BDCResult", ["ticker", "name", "trend", "signal", "records"])
+
 BDC_UNIVERSE = [
-    {"ticker": "ARCC", "name": "Ares Capital"},
-    {"ticker": "OBDC", "name": "Blue Owl Capital"},
-    {"ticker": "BXSL", "name": "Blackstone Secured Lending"},
-    {"ticker": "FSK",  "name": "FS KKR Capital"},
-    {"ticker": "MAIN", "name": "Main Street Capital"},
+    BDC("ARCC", "Ares Capital"),
+    BDC("OBDC", "Blue Owl Capital"),
+    BDC("BXSL", "Blackstone Secured Lending"),
+    BDC("FSK",  "FS KKR Capital"),
+    BDC("MAIN", "Main Street Capital"),
 ]
 
 DOWNLOAD_DIR = Path(__file__).parent.parent / "data" / "sec_filings"
 
+# Parsed keyword counts, keyed by filing document path, size and mtime
+PARSE_CACHE_DIR = Path(__file__).parent.parent / "data" / "cache"
+
+# Bump when the parsing logic changes so stale cached counts are ignored
+PARSE_CACHE_VERSION = 1
+
 # Number of quarters to analyze for trend per BDC
 NUM_QUARTERS = 4
 
-# Rate limiting delay between SEC requests (seconds)
-SEC_RATE_LIMIT_DELAY = 3
+# BDCs processed concurrently (downloads overlap with parsing)
+BDC_WORKERS = 3
+
+# Skip asking EDGAR for new 10-Qs if a ticker was checked this recently (hours).
+# 10-Qs arrive quarterly, so re-runs within a day can use the local copies.
+FILINGS_REFRESH_HOURS = 24
+
+# Worker processes shared by all BDCs for CPU-bound filing parses
+PARSE_WORKERS = min(4, os.cpu_count() or 1)
+
+# Parse workers are started lazily from the BDC threads, and forking while
+# other threads hold requests/urllib3 locks can deadlock the child, so use
+# forkserver where the platform has it and spawn elsewhere (Windows/macOS)
+PARSE_MP_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+# Cap on simultaneous EDGAR downloads. sec-edgar-downloader already throttles
+# every request to SEC's 10 req/s policy, this keeps bursts polite on top.
+SEC_DOWNLOAD_SLOTS = threading.Semaphore(3)
+
+# All distress keyword variants in one alternation, so a filing is scanned once.
+# The named group that matched tells which counter to bump. Case-insensitive
+# matching avoids a lowercased copy of the whole document.
+DISTRESS_KEYWORDS_RE = re.compile(
+    r"(?P<non_accrual>non(?:-|\s+)?accrual)"
+    r"|(?P<payment_default>payment(?:-|\s+)default)",
+    re.IGNORECASE,
+)
+
+# Same alternation for raw full-submission bytes
+DISTRESS_KEYWORDS_BYTES_RE = re.compile(DISTRESS_KEYWORDS_RE.pattern.encode(), re.IGNORECASE)
+
+# The SGML header sits at the top of full-submission.txt; this covers it
+FILING_HEADER_BYTES = 16384
+
+# SGML header date fields, in order of preference
+FILING_DATE_PATTERNS = [
+    re.compile(r"FILED AS OF DATE:\s*(\d{8})"),
+    re.compile(r"CONFORMED PERIOD OF REPORT:\s*(\d{8})"),
+    re.compile(r"DATE AS OF CHANGE:\s*(\d{8})"),
+]
+
+# Elements whose text content is not part of the visible document
+NON_TEXT_TAGS = {"script", "style"}
+
+# Bytes fed to the HTML parser per read when streaming a filing
+PARSE_CHUNK_SIZE = 1024 * 1024
+
+# Characters of document text buffered before scanning for keywords
+KEYWORD_SCAN_WINDOW = 256 * 1024
+
+# Trailing characters held back between scans, so a keyword that straddles
+# two windows is still matched once (must exceed the longest keyword match)
+KEYWORD_SCAN_OVERLAP = 256
+
+
+class DistressKeywordCounter:
+    """lxml parser target that counts distress keywords in a document's text.
+
+    Used with etree.HTMLParser(target=...): no element tree is built and the
+    visible text is scanned window by window as it streams in, so only one
+    window of text is held at a time. Script/style contents are skipped.
+    """
+
+    def __init__(self):
+        self.counts = {"non_accrual_count": 0, "payment_default_count": 0}
+        self.pending = []
+        self.pending_size = 0
+        self.carry = ""
+        self.skip_depth = 0
+
+    def start(self, tag, attrib):
+        if tag in NON_TEXT_TAGS:
+            self.skip_depth += 1
+
+    def end(self, tag):
+        if tag in NON_TEXT_TAGS:
+            self.skip_depth -= 1
+
+    def data(self, data):
+        if self.skip_depth:
+            return
+        self.pending.append(data)
+        self.pending_size += len(data)
+        if self.pending_size >= KEYWORD_SCAN_WINDOW:
+            self.scan(final=False)
+
+    def scan(self, final):
+        text = self.carry + "".join(self.pending)
+        self.pending = []
+        self.pending_size = 0
+
+        # Matches starting near the end may continue in text not seen yet;
+        # leave them for the next window
+        cutoff = len(text) if final else len(text) - KEYWORD_SCAN_OVERLAP
+        resume = 0
+        for match in DISTRESS_KEYWORDS_RE.finditer(text):
+            if match.start() >= cutoff:
+                break
+            self.counts[f"{match.lastgroup}_count"] += 1
+            resume = match.end()
+        self.carry = text[max(resume, cutoff):]
+
+    def close(self):
+        self.scan(final=True)
+        return self.counts
+
+
+def count_keywords_in_html(path):
+    """Stream a filing through lxml's HTML parser and count distress keywords.
+
+    Args:
+        path: Path to an HTML filing document.
+
+    Returns:
+        Dict with non_accrual_count and payment_default_count.
+    """
+    from lxml import etree
+
+    parser = etree.HTMLParser(target=DistressKeywordCounter(), encoding="utf-8", huge_tree=True)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(PARSE_CHUNK_SIZE), b""):
+            parser.feed(chunk)
+    return parser.close()
+
+
+@lru_cache(maxsize=None)
+def get_downloader():
+    """Return the shared EDGAR downloader.
+
+    Creating a Downloader fetches SEC's ticker-to-CIK map, so one instance
+    is reused for every ticker instead of re-fetching the map per BDC.
+    """
+    # Deferred: sec_edgar_downloader is slow to import and only needed here
+    from sec_edgar_downloader import Downloader
+
+    return Downloader("ShadowBank", "risk-bot@shadowbank.com", DOWNLOAD_DIR)
+
+
+def list_local_filings(ticker):
+    """List a ticker's downloaded 10-Q filing directories.
+
+    Args:
+        ticker: Stock ticker symbol (e.g., "ARCC").
+
+    Returns:
+        List of filing directory paths, sorted by filing date (oldest first).
+    """
+    # Filings are saved under sec-edgar-filings/<ticker>/10-Q/<accession>
+    tenq_dir = DOWNLOAD_DIR / "sec-edgar-filings" / ticker / "10-Q"
+    if not tenq_dir.exists():
+        return []
+
+    # scandir's DirEntry carries the file type, so no stat() per filing
+    with os.scandir(tenq_dir) as entries:
+        filings = [Path(e.path) for e in entries if e.is_dir()]
+
+    # Accession numbers start with the filer agent's CIK, so they are not
+    # chronological across agents; order by the SGML filing date instead
+    return sorted(filings, key=lambda path: (extract_filing_date(path) or "", path.name))
 
 
 @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
 def download_10q_filings(ticker, limit=4):
     """Download multiple 10-Q filings for a given ticker.
 
+    EDGAR is not contacted when enough filings are on disk and the ticker
+    was checked within FILINGS_REFRESH_HOURS.
+
     Args:
         ticker: Stock ticker symbol (e.g., "ARCC").
         limit: Number of filings to download.
@@ -59,21 +241,33 @@ def download_10q_filings(ticker, limit=4):
     try:
         DOWNLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
-        logger.info(f"Downloading last {limit} 10-Q filings for {ticker}")
-        dl = Downloader("ShadowBank", "risk-bot@shadowbank.com", DOWNLOAD_DIR)
-        dl.get("10-Q", ticker, limit=limit)
-
-        # Find all downloaded filings - search by ticker
-        filings_base = DOWNLOAD_DIR / "sec-edgar-filings"
-        if filings_base.exists():
-            # Find the CIK directory for this ticker
-            for cik_dir in filings_base.iterdir():
-                tenq_dir = cik_dir / "10-Q"
-                if tenq_dir.exists():
-                    filings = sorted(tenq_dir.iterdir(), key=lambda p: p.name)
-                    if filings:
-                        logger.info(f"Found {len(filings)} 10-Q filings for {ticker}")
-                        return filings[-limit:]  # Return most recent 'limit' filings
+        # Touched after every successful EDGAR check for this ticker
+        checked_marker = DOWNLOAD_DIR / f"{ticker}.10q-checked"
+
+        filings = list_local_filings(ticker)
+        is_fresh = (
+            len(filings) >= limit
+            and checked_marker.exists()
+            and time.time() - checked_marker.stat().st_mtime < FILINGS_REFRESH_HOURS * 3600
+        )
+
+        if is_fresh:
+            logger.info(f"Using local 10-Q filings for {ticker} (checked within {FILINGS_REFRESH_HOURS}h)")
+        else:
+            logger.info(f"Downloading last {limit} 10-Q filings for {ticker}")
+            with SEC_DOWNLOAD_SLOTS:
+                get_downloader().get("10-Q", ticker, limit=limit)
+            checked_marker.touch()
+            filings = list_local_filings(ticker)
+
+            # Downloads are kept between runs; drop quarters no longer needed
+            for stale in filings[:-limit]:
+                shutil.rmtree(stale, ignore_errors=True)
+            filings = filings[-limit:]
+
+        if filings:
+            logger.info(f"Found {len(filings)} 10-Q filings for {ticker}")
+            return filings[-limit:]  # Return most recent 'limit' filings
 
         logger.warning(f"No 10-Q filings found for {ticker}")
         return []
@@ -83,11 +277,53 @@ def download_10q_filings(ticker, limit=4):
         return []
 
 
-def extract_filing_date(filing_path):
+def find_filing_documents(filing_path):
+    """Locate a filing's main document and the file holding its SGML header.
+
+    Args:
+        filing_path: Path to the filing directory.
+
+    Returns:
+        Tuple of (main_file, header_file). main_file is the largest HTML
+        document (else the largest .txt); header_file is full-submission.txt
+        (else the first .txt, else main_file). Either may be None.
+    """
+    # One directory pass; DirEntry.stat() reuses what scandir already fetched
+    largest = {".html": (-1, None), ".txt": (-1, None)}
+    txt_names = []
+    with os.scandir(filing_path) as entries:
+        for entry in entries:
+            suffix = os.path.splitext(entry.name)[1]
+            if suffix == ".htm":
+                suffix = ".html"
+            if suffix not in largest or not entry.is_file():
+                continue
+            if suffix == ".txt":
+                txt_names.append(entry.name)
+            size = entry.stat().st_size
+            if size > largest[suffix][0]:
+                largest[suffix] = (size, entry.name)
+
+    main_name = largest[".html"][1] or largest[".txt"][1]
+    main_file = filing_path / main_name if main_name else None
+
+    header_file = main_file
+    if txt_names:
+        header_name = "full-submission.txt" if "full-submission.txt" in txt_names else min(txt_names)
+        header_file = filing_path / header_name
+
+    return main_file, header_file
+
+
+def extract_filing_date(filing_path, header_file=None, header=None):
     """Extract the filing date from an SEC filing.
 
     Args:
         filing_path: Path to the filing directory.
+        header_file: Optional file holding the SGML header, when the caller
+            has already located it with find_filing_documents.
+        header: Optional leading bytes of header_file the caller already
+            has (e.g. a slice of its mmap), so the file isn't reopened.
 
     Returns:
         Filing date as string (YYYY-MM-DD) or None if not found.
@@ -104,28 +340,20 @@ def extract_filing_date(filing_path):
             else:
                 year = int(year_part)
 
-        # Try to find filing date in the document
-        html_files = list(filing_path.glob("*.htm")) + list(filing_path.glob("*.html"))
-        txt_files = list(filing_path.glob("*.txt"))
-
-        main_file = None
-        if html_files:
-            main_file = max(html_files, key=lambda p: p.stat().st_size)
-        elif txt_files:
-            main_file = max(txt_files, key=lambda p: p.stat().st_size)
+        # Try to find filing date in the SGML header of the submission text
+        if header_file is None:
+            _, header_file = find_filing_documents(filing_path)
 
-        if main_file:
-            with open(main_file, "r", encoding="utf-8", errors="ignore") as f:
-                content = f.read()
+        if header is None and header_file:
+            # Only the header is needed, not the multi-MB document body
+            with open(header_file, "rb") as f:
+                header = f.read(FILING_HEADER_BYTES)
 
-            date_patterns = [
-                r"FILED AS OF DATE:\s*(\d{8})",
-                r"CONFORMED PERIOD OF REPORT:\s*(\d{8})",
-                r"DATE AS OF CHANGE:\s*(\d{8})",
-            ]
+        if header:
+            content = header[:FILING_HEADER_BYTES].decode("latin-1")
 
-            for pattern in date_patterns:
-                match = re.search(pattern, content)
+            for pattern in FILING_DATE_PATTERNS:
+                match = pattern.search(content)
                 if match:
                     date_str = match.group(1)
                     return f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}"
@@ -150,6 +378,24 @@ def extract_filing_date(filing_path):
         return None
 
 
+def parse_cache_path(main_file):
+    """Return the cache file for a filing document's parsed counts.
+
+    The key covers the document's path, size and mtime, so a re-downloaded
+    or modified filing misses the cache without hashing its contents.
+
+    Args:
+        main_file: Path to the filing document that gets parsed.
+
+    Returns:
+        Path to the JSON cache entry (which may not exist yet).
+    """
+    st = main_file.stat()
+    key_source = f"{PARSE_CACHE_VERSION}:{main_file.resolve()}:{st.st_size}:{st.st_mtime_ns}"
+    key = hashlib.blake2b(key_source.encode(), digest_size=16).hexdigest()
+    return PARSE_CACHE_DIR / f"{key}.json"
+
+
 def count_distress_keywords(filing_path):
     """Count distress keywords in a 10-Q filing.
 
@@ -168,43 +414,49 @@ def count_distress_keywords(filing_path):
     }
 
     try:
-        counts["filing_date"] = extract_filing_date(filing_path)
-
-        html_files = list(filing_path.glob("*.htm")) + list(filing_path.glob("*.html"))
-        txt_files = list(filing_path.glob("*.txt"))
-
-        if html_files:
-            main_file = max(html_files, key=lambda p: p.stat().st_size)
-        elif txt_files:
-            main_file = max(txt_files, key=lambda p: p.stat().st_size)
-        else:
+        # Resolve the documents once and share them with date extraction
+        main_file, header_file = find_filing_documents(filing_path)
+        if main_file is None:
+            counts["filing_date"] = extract_filing_date(filing_path, header_file)
             logger.warning(f"No filing documents found in {filing_path}")
             return counts
 
-        logger.info(f"Parsing filing: {filing_path.name} ({main_file.stat().st_size / 1024 / 1024:.1f} MB)")
-
-        with open(main_file, "r", encoding="utf-8", errors="ignore") as f:
-            soup = BeautifulSoup(f.read(), "html.parser")
+        # Unchanged filings were already parsed on a previous run
+        cache_path = parse_cache_path(main_file)
+        try:
+            cached = json.loads(cache_path.read_text(encoding="utf-8"))
+            logger.info(f"Using cached counts for filing {filing_path.name}")
+            return {**counts, **cached}
+        except (OSError, ValueError):
+            pass
 
-        text = soup.get_text().lower()
-
-        # Count non-accrual variations
-        non_accrual_patterns = [r"non-accrual", r"nonaccrual", r"non\s+accrual"]
-        for pattern in non_accrual_patterns:
-            matches = re.findall(pattern, text)
-            counts["non_accrual_count"] += len(matches)
+        logger.info(f"Parsing filing: {filing_path.name} ({main_file.stat().st_size / 1024 / 1024:.1f} MB)")
 
-        # Count payment default variations
-        payment_default_patterns = [r"payment\s+default", r"payment-default"]
-        for pattern in payment_default_patterns:
-            matches = re.findall(pattern, text)
-            counts["payment_default_count"] += len(matches)
+        # Count non-accrual and payment default variations in a single pass
+        if main_file.suffix == ".txt":
+            # Full-submission SGML is not HTML: scan the mapped bytes directly
+            with open(main_file, "rb") as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # The SGML header is at the top of this same file: reuse the mapping
+                header = mm[:FILING_HEADER_BYTES] if header_file == main_file else None
+                counts["filing_date"] = extract_filing_date(filing_path, header_file, header)
+                for match in DISTRESS_KEYWORDS_BYTES_RE.finditer(mm):
+                    counts[f"{match.lastgroup}_count"] += 1
+        else:
+            counts["filing_date"] = extract_filing_date(filing_path, header_file)
+            counts.update(count_keywords_in_html(main_file))
 
         counts["total_distress_count"] = counts["non_accrual_count"] + counts["payment_default_count"]
 
         logger.info(f"Filing {filing_path.name}: non-accrual={counts['non_accrual_count']}, "
                    f"date={counts['filing_date']}")
 
+        try:
+            PARSE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            cache_path.write_text(json.dumps(counts), encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"Failed to cache counts for filing {filing_path.name}: {e}")
+
         return counts
 
     except Exception as e:
@@ -212,6 +464,25 @@ def count_distress_keywords(filing_path):
         return counts
 
 
+def classify_trend(first_half_avg, second_half_avg, change):
+    """Map half-period averages and the overall change to a trend signal.
+
+    Args:
+        first_half_avg: Average non-accrual count over the earlier quarters.
+        second_half_avg: Average non-accrual count over the later quarters.
+        change: Latest count minus the earliest count.
+
+    Returns:
+        Tuple of (signal_str, color_indicator).
+    """
+    if second_half_avg > first_half_avg * 1.1 or change > 10:
+        return "DETERIORATING", "[!]"
+    elif second_half_avg < first_half_avg * 0.9 or change < -10:
+        return "IMPROVING", "[+]"
+    else:
+        return "STABLE", "[=]"
+
+
 def determine_trend_signal(quarterly_data):
     """Determine the trend signal from quarterly data.
 
@@ -226,17 +497,14 @@ def determine_trend_signal(quarterly_data):
 
     counts = [q["non_accrual_count"] for q in quarterly_data]
 
-    first_half_avg = sum(counts[:len(counts)//2]) / max(1, len(counts)//2)
-    second_half_avg = sum(counts[len(counts)//2:]) / max(1, len(counts) - len(counts)//2)
+    # Common case: a full NUM_QUARTERS=4 history, unrolled with no slicing
+    if len(counts) == 4:
+        c0, c1, c2, c3 = counts
+        return classify_trend((c0 + c1) / 2, (c2 + c3) / 2, c3 - c0)
 
-    change = counts[-1] - counts[0]
-
-    if second_half_avg > first_half_avg * 1.1 or change > 10:
-        return "DETERIORATING", "[!]"
-    elif second_half_avg < first_half_avg * 0.9 or change < -10:
-        return "IMPROVING", "[+]"
-    else:
-        return "STABLE", "[=]"
+    # len(counts) >= 2, so both halves are non-empty
+    half = len(counts) // 2
+    return classify_trend(fmean(counts[:half]), fmean(counts[half:]), counts[-1] - counts[0])
 
 
 def create_risk_record(filing_data, quarter_label, fund_name):
@@ -262,21 +530,23 @@ def create_risk_record(filing_data, quarter_label, fund_name):
     }
 
 
-def process_single_bdc(bdc, bdc_index, total_bdcs):
+def process_single_bdc(bdc, bdc_index, total_bdcs, executor=None):
     """Process a single BDC - download filings and analyze.
 
     Args:
-        bdc: Dictionary with ticker and name.
+        bdc: BDC tuple with ticker and name.
         bdc_index: Current index (1-based) for progress display.
         total_bdcs: Total number of BDCs being processed.
+        executor: Optional executor used to parse the filings in parallel.
+            Filings are parsed one at a time when omitted.
 
     Returns:
         Tuple of (records_saved, quarterly_data, trend_str, signal).
     """
-    ticker = bdc["ticker"]
-    name = bdc["name"]
+    ticker, name = bdc
 
-    print(f"\nProcessing {bdc_index}/{total_bdcs}: {name} ({ticker})...", end=" ", flush=True)
+    # BDCs run concurrently, so every progress message is a complete line
+    print(f"Processing {bdc_index}/{total_bdcs}: {name} ({ticker})...", flush=True)
     logger.info(f"Processing BDC {bdc_index}/{total_bdcs}: {name} ({ticker})")
 
     try:
@@ -284,15 +554,13 @@ def process_single_bdc(bdc, bdc_index, total_bdcs):
         filing_paths = download_10q_filings(ticker, limit=NUM_QUARTERS)
 
         if not filing_paths:
-            print("No filings found.")
+            print(f"   {ticker}: No filings found.")
             logger.warning(f"No filings found for {ticker}")
             return 0, [], "N/A", "NO_DATA"
 
-        # Analyze each filing
-        quarterly_data = []
-        for filing_path in filing_paths:
-            data = count_distress_keywords(filing_path)
-            quarterly_data.append(data)
+        # Analyze each filing (independent CPU-bound parses)
+        mapper = executor.map if executor else map
+        quarterly_data = list(mapper(count_distress_keywords, filing_paths))
 
         # Sort by filing date (oldest first)
         quarterly_data.sort(key=lambda x: x.get("filing_date") or "")
@@ -301,39 +569,40 @@ def process_single_bdc(bdc, bdc_index, total_bdcs):
         signal, color = determine_trend_signal(quarterly_data)
 
         # Build trend string
-        trend_parts = []
-        for i, q in enumerate(quarterly_data):
-            count = q["non_accrual_count"]
-            trend_parts.append(f"Q{i+1}({count})")
-        trend_str = " -> ".join(trend_parts)
+        trend_str = " -> ".join(
+            f"Q{i}({q['non_accrual_count']})" for i, q in enumerate(quarterly_data, 1)
+        )
 
-        # Save records to database
-        saved_count = 0
+        # Build records, then save them in one transaction
+        records = []
         for i, data in enumerate(quarterly_data):
             quarter_label = f"Q{i+1}"
             if data.get("filing_date"):
                 try:
-                    dt = datetime.strptime(data["filing_date"], "%Y-%m-%d")
-                    q_num = (dt.month - 1) // 3 + 1
-                    quarter_label = f"Q{q_num} {dt.year}"
+                    # filing_date is always YYYY-MM-DD here; slicing skips strptime
+                    filing_date = data["filing_date"]
+                    year, month = int(filing_date[:4]), int(filing_date[5:7])
+                    q_num = (month - 1) // 3 + 1
+                    quarter_label = f"Q{q_num} {year}"
                 except:
                     pass
 
-            record = create_risk_record(data, quarter_label, name)
+            records.append(create_risk_record(data, quarter_label, name))
 
-            try:
-                save_loan(record)
-                saved_count += 1
-            except Exception as e:
-                logger.error(f"Failed to save record for {name}: {e}")
+        saved_count = 0
+        try:
+            save_loans_bulk(records)
+            saved_count = len(records)
+        except Exception as e:
+            logger.error(f"Failed to save records for {name}: {e}")
 
-        print(f"Done. {color} {signal}")
+        print(f"   {ticker}: Done. {color} {signal}")
         logger.info(f"{name}: {trend_str} - Signal: {signal} - Saved: {saved_count} records")
 
         return saved_count, quarterly_data, trend_str, signal
 
     except Exception as e:
-        print(f"ERROR: {e}")
+        print(f"   {ticker}: ERROR: {e}")
         logger.error(f"Failed to process {ticker}: {e}")
         return 0, [], "ERROR", "FAILED"
 
@@ -352,7 +621,7 @@ def run_scraper():
         print("\n" + "="*60)
         print("BDC UNIVERSE DISTRESS TREND ANALYSIS")
         print("="*60)
-        print(f"Analyzing {len(BDC_UNIVERSE)} BDCs: {', '.join(b['ticker'] for b in BDC_UNIVERSE)}")
+        print(f"Analyzing {len(BDC_UNIVERSE)} BDCs: {', '.join(b.ticker for b in BDC_UNIVERSE)}")
 
         # Initialize database
         init_db()
@@ -360,29 +629,28 @@ def run_scraper():
         total_saved = 0
         results = []
 
-        for i, bdc in enumerate(BDC_UNIVERSE, 1):
-            saved, quarterly_data, trend_str, signal = process_single_bdc(bdc, i, len(BDC_UNIVERSE))
-            total_saved += saved
-            results.append({
-                "name": bdc["name"],
-                "ticker": bdc["ticker"],
-                "trend": trend_str,
-                "signal": signal,
-                "records": saved
-            })
-
-            # Rate limiting - be polite to SEC servers
-            if i < len(BDC_UNIVERSE):
-                print(f"   (Rate limit: waiting {SEC_RATE_LIMIT_DELAY}s before next request...)")
-                time.sleep(SEC_RATE_LIMIT_DELAY)
+        # Process BDCs concurrently; map() yields results in universe order.
+        # Their filing parses share one process pool.
+        total_bdcs = len(BDC_UNIVERSE)
+        with ProcessPoolExecutor(max_workers=PARSE_WORKERS, mp_context=PARSE_MP_CONTEXT) as parse_pool, \
+                ThreadPoolExecutor(max_workers=BDC_WORKERS) as executor:
+            outcomes = executor.map(
+                partial(process_single_bdc, executor=parse_pool),
+                BDC_UNIVERSE,
+                range(1, total_bdcs + 1),
+                [total_bdcs] * total_bdcs,
+            )
+            for bdc, (saved, quarterly_data, trend_str, signal) in zip(BDC_UNIVERSE, outcomes):
+                total_saved += saved
+                results.append(BDCResult(bdc.ticker, bdc.name, trend_str, signal, saved))
 
         # Print summary
         print("\n" + "="*60)
         print("SUMMARY")
         print("="*60)
         for r in results:
-            status = "[!]" if r["signal"] == "DETERIORATING" else "[+]" if r["signal"] == "IMPROVING" else "[=]"
-            print(f"{r['ticker']:6} | {r['name']:30} | {status} {r['signal']:15} | {r['records']} records")
+            status = "[!]" if r.signal == "DETERIORATING" else "[+]" if r.signal == "IMPROVING" else "[=]"
+            print(f"{r.ticker:6} | {r.name:30} | {status} {r.signal:15} | {r.records} records")
         print("="*60)
         print(f"Total records saved: {total_saved}")
 
@@ -0,0 +1,78 @@
+"""Shared HTTP helpers for the scrapers."""
+
+import atexit
+import sys
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from db_manager import get_http_validators, save_http_validators
+
+# Returned by fetchers when the source has not changed since the last run
+NOT_MODIFIED = object()
+
+# One pooled session for every scraper request, so connections (and TLS
+# sessions) to the same host are reused across fetches and retries.
+# Transient failures are retried here with exponential backoff.
+SESSION = requests.Session()
+SESSION.headers.update({
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+})
+HTTP_ADAPTER = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=10,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=1,
+        status_forcelist=(429, 500, 502, 503, 504),
+        raise_on_status=False,
+    ),
+)
+SESSION.mount("https://", HTTP_ADAPTER)
+SESSION.mount("http://", HTTP_ADAPTER)
+atexit.register(SESSION.close)
+
+
+def conditional_get(url, headers=None, timeout=30, stream=False):
+    """GET a URL, revalidating against the validators stored for it.
+
+    Sends If-None-Match / If-Modified-Since from the last response passed to
+    remember_validators, so an unchanged source answers 304 with no body.
+
+    Args:
+        url: URL to fetch.
+        headers: Optional extra request headers.
+        timeout: Request timeout in seconds.
+        stream: If True, leave the body unread for iter_content.
+
+    Returns:
+        requests.Response. Status 304 means the content is unchanged.
+    """
+    headers = dict(headers or {})
+    etag, last_modified = get_http_validators(url)
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    return SESSION.get(url, headers=headers, timeout=timeout, stream=stream)
+
+
+def remember_validators(url, response):
+    """Store a response's ETag/Last-Modified for the next conditional_get.
+
+    Call this only once the response body has been parsed successfully, so
+    a failed run is retried in full instead of being answered with a 304.
+
+    Args:
+        url: URL that was fetched.
+        response: The successful requests.Response.
+    """
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if etag or last_modified:
+        save_http_validators(url, etag, last_modified)
@@ -1,18 +1,22 @@
 """WARN Notice Scraper for layoff tracking."""
 
+import calendar
 import logging
+import math
+import re
 import sys
-from datetime import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
 from pathlib import Path
-from io import StringIO
 
-import pandas as pd
+import lxml.html
 import requests
-from tenacity import retry, stop_after_attempt, wait_exponential
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from db_manager import init_db, save_warn
+from db_manager import init_db, save_warns_bulk
+from scrapers.http_client import NOT_MODIFIED, conditional_get, remember_validators
 
 # Configure logging to file
 LOG_PATH = Path(__file__).parent.parent / "scraping_log.txt"
@@ -24,6 +28,49 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Largest WARN page we will download, to cap memory if the source misbehaves
+MAX_PAGE_BYTES = 20 * 1024 * 1024
+
+# NY DOL pages are UTF-8; decoding happens inside libxml2, not in Python
+HTML_PARSER = lxml.html.HTMLParser(encoding="utf-8")
+
+# Header keyword rules, tried in priority order; the named group that
+# matches is the field. Lookaheads test the whole header for each rule,
+# so e.g. "Notice Date" is a NoticeDate and "Employer Name" a Company.
+COLUMN_FIELD_RULES = (
+    ("Company", r"(?=.*(?:company|employer|name))"),
+    ("NoticeDate", r"(?=.*date)(?=.*(?:posted|notice))"),
+    ("AnyDate", r"(?=.*date)"),
+    ("Employees", r"(?=.*(?:affected|employee|worker|number))"),
+    ("Reason", r"(?=.*(?:reason|type))"),
+)
+COLUMN_FIELD_RE = re.compile(
+    "|".join(f"{rule}(?P<{field}>)" for field, rule in COLUMN_FIELD_RULES),
+    re.IGNORECASE | re.DOTALL,
+)
+# Once a date column is mapped, other generic date headers fall through
+COLUMN_FIELD_AFTER_DATE_RE = re.compile(
+    "|".join(f"{rule}(?P<{field}>)" for field, rule in COLUMN_FIELD_RULES if field != "AnyDate"),
+    re.IGNORECASE | re.DOTALL,
+)
+
+# Everything but digits, stripped from employee counts ("1,200 employees")
+NON_DIGITS_RE = re.compile(r"\D+")
+
+# Date formats seen on WARN pages, grouped by their separator
+SLASH_FORMATS = ("%m/%d/%Y", "%m/%d/%y")
+DASH_NUM_FORMATS = ("%m-%d-%Y", "%Y-%m-%d")
+MONTH_WORD_FORMATS = ("%B %d, %Y", "%b %d, %Y")
+
+# Full and abbreviated month names ("march", "mar") -> month number
+MONTHS = {
+    name.lower(): number
+    for names in (calendar.month_name, calendar.month_abbr)
+    for number, name in enumerate(names)
+    if name
+}
+
+
 # =============================================================================
 # NEW YORK STATE WARN SCRAPER - Year-Specific Archive
 # =============================================================================
@@ -40,37 +87,74 @@ def get_ny_warn_url(year):
     return f"https://dol.ny.gov/{year}-warn-notices"
 
 
-def fetch_ny_warn_page(url):
+def fetch_ny_warn_page(url, turn=None, cancel=None):
     """Fetch the NY WARN page.
 
+    The request is conditional on the validators stored for the URL, so an
+    unchanged page answers 304 with no body. The body is streamed and kept
+    as raw bytes for lxml, and pages larger than MAX_PAGE_BYTES are rejected
+    before they are buffered in full.
+
     Args:
         url: URL to fetch.
+        turn: Optional threading.Event. When given, the body is not read
+            until it is set, so a fallback only downloads once it is needed.
+        cancel: Optional threading.Event. Once set, the page is abandoned
+            and its connection closed instead of being downloaded.
 
     Returns:
-        Tuple of (HTML content, status_code) or (None, status_code) on failure.
+        Tuple of (HTML bytes, response), (NOT_MODIFIED, response) if the page
+        is unchanged since the last successful scrape, or (None, response)
+        on failure. response is None if the request itself failed.
     """
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-    }
-
     try:
-        response = requests.get(url, headers=headers, timeout=30)
-        if response.status_code == 200:
-            return response.text, 200
-        else:
-            return None, response.status_code
+        with conditional_get(url, timeout=30, stream=True) as response:
+            if response.status_code == 304:
+                return NOT_MODIFIED, response
+            if response.status_code != 200:
+                return None, response
+
+            content_length = response.headers.get("Content-Length", "")
+            if content_length.isdigit() and int(content_length) > MAX_PAGE_BYTES:
+                logger.warning(f"Skipping {url}: page is {content_length} bytes")
+                return None, response
+
+            if turn is not None:
+                turn.wait()
+            if cancel is not None and cancel.is_set():
+                return None, response
+
+            # Content-Length can be missing (or describe the compressed body)
+            chunks = []
+            size = 0
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                if cancel is not None and cancel.is_set():
+                    return None, response
+                size += len(chunk)
+                if size > MAX_PAGE_BYTES:
+                    logger.warning(f"Skipping {url}: page exceeds {MAX_PAGE_BYTES} bytes")
+                    return None, response
+                chunks.append(chunk)
+
+            return b"".join(chunks), response
     except requests.RequestException as e:
         logger.warning(f"Request failed for {url}: {e}")
-        return None, 0
+        return None, None
 
 
 def fetch_ny_warn_with_fallback():
     """Fetch NY WARN data with year fallback mechanism.
 
-    Tries current year first, falls back to previous year, then main page.
+    Prefers the current year, then the previous year, then the main page.
+    All three requests are sent at once, so a missing or slow current-year
+    page no longer delays the fallbacks, but a fallback only downloads its
+    body once every URL ahead of it has failed; the first URL in priority
+    order that succeeds (or is unchanged since the last scrape) is used.
 
     Returns:
-        Tuple of (HTML content, year used) or (None, None) on failure.
+        Tuple of (HTML content, year used, url, response), where HTML content
+        is NOT_MODIFIED if that page is unchanged; (None, None, None, None)
+        on failure.
     """
     current_year = datetime.now().year
     previous_year = current_year - 1
@@ -82,18 +166,99 @@ def fetch_ny_warn_with_fallback():
         ("https://dol.ny.gov/warn-notices", current_year),  # Main page fallback
     ]
 
-    for url, year in urls_to_try:
-        logger.info(f"Trying URL: {url}")
-        html_content, status_code = fetch_ny_warn_page(url)
-
-        if html_content:
-            logger.info(f"Successfully fetched WARN data from {url}")
-            return html_content, year
+    # turns[i] lets URL i read its body; cancel abandons every unused fetch
+    turns = [threading.Event() for _ in urls_to_try]
+    turns[0].set()
+    cancel = threading.Event()
 
-        logger.info(f"URL not available (status: {status_code})")
+    executor = ThreadPoolExecutor(max_workers=len(urls_to_try))
+    try:
+        futures = []
+        for (url, year), turn in zip(urls_to_try, turns):
+            logger.info(f"Trying URL: {url}")
+            futures.append(executor.submit(fetch_ny_warn_page, url, turn, cancel))
+
+        # Wait in priority order: a lower-priority page is only downloaded
+        # and used if every URL ahead of it has failed
+        for index, ((url, year), future) in enumerate(zip(urls_to_try, futures)):
+            html_content, response = future.result()
+
+            if html_content is NOT_MODIFIED:
+                logger.info(f"WARN page not modified since last run: {url}")
+                return html_content, year, url, response
+
+            if html_content:
+                logger.info(f"Successfully fetched WARN data from {url}")
+                return html_content, year, url, response
+
+            status_code = response.status_code if response is not None else 0
+            logger.info(f"URL not available: {url} (status: {status_code})")
+            if index + 1 < len(turns):
+                turns[index + 1].set()
+    finally:
+        # Release fallbacks still waiting for their turn so they close their
+        # connections, and drop any that have not started
+        cancel.set()
+        for turn in turns:
+            turn.set()
+        executor.shutdown(wait=False, cancel_futures=True)
 
     logger.error("Failed to fetch WARN data from all sources")
-    return None, None
+    return None, None, None, None
+
+
+def is_missing(value):
+    """Check for an absent cell value (None or NaN), like pandas.isna for scalars.
+
+    Args:
+        value: Cell value.
+
+    Returns:
+        True if the value is None or a float NaN.
+    """
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def fast_parse_date(date_str):
+    """Parse the common WARN date shapes with plain string splits and int().
+
+    Handles MM/DD/YYYY, MM/DD/YY, MM-DD-YYYY, YYYY-MM-DD and "Month DD, YYYY"
+    (full or abbreviated month), accepting exactly what the matching strptime
+    format would.
+
+    Args:
+        date_str: Stripped date string.
+
+    Returns:
+        Date in YYYY-MM-DD format, or None if the string has another shape
+        or is not a real date.
+    """
+    try:
+        if date_str[:1].isalpha():
+            month_name, _, rest = date_str.partition(" ")
+            day, _, year = rest.partition(", ")
+            month = str(MONTHS[month_name.lower()])
+        elif "/" in date_str:
+            month, day, year = date_str.split("/")
+            if len(year) == 2 and year.isdigit():
+                # Same pivot as strptime's %y: 69-99 -> 19xx, 00-68 -> 20xx
+                year = str(int(year) + (1900 if int(year) >= 69 else 2000))
+        else:
+            first, second, third = date_str.split("-")
+            if len(first) == 4:
+                year, month, day = first, second, third
+            else:
+                month, day, year = first, second, third
+
+        if not (month.isdigit() and len(month) <= 2 and day.isdigit() and len(day) <= 2
+                and year.isdigit() and len(year) == 4):
+            return None
+
+        parsed = date(int(year), int(month), int(day))
+    except (KeyError, ValueError):
+        return None
+
+    return f"{parsed.year:04d}-{parsed.month:02d}-{parsed.day:02d}"
 
 
 def parse_date(date_str):
@@ -105,20 +270,25 @@ def parse_date(date_str):
     Returns:
         Date in YYYY-MM-DD format or None if parsing fails.
     """
-    if pd.isna(date_str) or not date_str:
+    if is_missing(date_str) or not date_str:
         return None
 
     date_str = str(date_str).strip()
 
-    # Try common date formats
-    formats = [
-        "%m/%d/%Y",
-        "%m-%d-%Y",
-        "%Y-%m-%d",
-        "%B %d, %Y",
-        "%b %d, %Y",
-        "%m/%d/%y",
-    ]
+    parsed = fast_parse_date(date_str)
+    if parsed:
+        return parsed
+
+    # Unusual spacing and the like: pick the candidate formats by separator,
+    # so at most two strptime calls run
+    if date_str[:1].isalpha():
+        formats = MONTH_WORD_FORMATS
+    elif "/" in date_str:
+        formats = SLASH_FORMATS
+    elif "-" in date_str:
+        formats = DASH_NUM_FORMATS
+    else:
+        return None
 
     for fmt in formats:
         try:
@@ -138,14 +308,26 @@ def parse_employees(emp_str):
     Returns:
         Integer employee count or 0 if parsing fails.
     """
-    if pd.isna(emp_str):
+    if is_missing(emp_str):
         return 0
 
     # Extract digits only
-    digits = "".join(filter(str.isdigit, str(emp_str)))
+    digits = NON_DIGITS_RE.sub("", str(emp_str))
     return int(digits) if digits else 0
 
 
+def table_cell_text(cell):
+    """Return a table cell's text with whitespace runs collapsed to single spaces.
+
+    Args:
+        cell: lxml <td> or <th> element.
+
+    Returns:
+        Normalized cell text ("" for an empty cell).
+    """
+    return " ".join(cell.text_content().split())
+
+
 def scrape_ny_warn_notices():
     """Scrape WARN notices from New York State Department of Labor archive.
 
@@ -163,89 +345,99 @@ def scrape_ny_warn_notices():
 
     try:
         # Fetch with fallback mechanism
-        html_content, year_used = fetch_ny_warn_with_fallback()
+        html_content, year_used, url, response = fetch_ny_warn_with_fallback()
+
+        if html_content is NOT_MODIFIED:
+            # Notices were already saved on the run that last fetched the page
+            logger.info("NY WARN page unchanged; no new notices to scrape")
+            return notices
 
         if not html_content:
             logger.warning("No WARN data available from NY DOL")
             return notices
 
-        # Use pandas to extract tables from HTML
-        tables = pd.read_html(StringIO(html_content), flavor="lxml")
+        # Parse the raw bytes once with lxml and read the WARN table's cells directly
+        doc = lxml.html.fromstring(html_content, parser=HTML_PARSER)
+        # The WARN table is typically the first/main table
+        table = next(doc.iter("table"), None)
 
-        if not tables:
+        if table is None:
             logger.warning("No tables found on NY WARN page")
             return notices
 
-        # The WARN table is typically the first/main table
-        df = tables[0]
-        logger.info(f"Found table with {len(df)} rows and columns: {list(df.columns)}")
+        # Walk the tree with element iterators; no XPath is evaluated per row
+        rows = list(table.iter("tr"))
+        header_cells = list(rows[0].iterchildren("th", "td")) if rows else []
+        if rows and (table.find("thead") is not None or all(cell.tag == "th" for cell in header_cells)):
+            headers = [table_cell_text(cell) for cell in header_cells]
+            rows = rows[1:]
+        else:
+            headers = []
+        logger.info(f"Found table with {len(rows)} rows and columns: {headers}")
 
         # Column mapping for year-specific archive pages
         # Common columns: 'Company', 'Date Posted'/'Notice Date', 'Number Affected'/'Workforce Affected', 'Reason'
         column_mapping = {}
-        for col in df.columns:
-            col_lower = str(col).lower()
-            if "company" in col_lower or "employer" in col_lower or "name" in col_lower:
-                column_mapping[col] = "Company"
-            elif "date" in col_lower and ("posted" in col_lower or "notice" in col_lower):
-                column_mapping[col] = "Date"
-            elif "date" in col_lower and "Date" not in column_mapping.values():
-                # Fallback: any date column
-                column_mapping[col] = "Date"
-            elif "affected" in col_lower or "employee" in col_lower or "worker" in col_lower or "number" in col_lower:
-                column_mapping[col] = "Employees"
-            elif "reason" in col_lower or "type" in col_lower:
-                column_mapping[col] = "Reason"
-
-        df = df.rename(columns=column_mapping)
+        date_assigned = False
+        for col_index, col in enumerate(headers):
+            # Only the first date column falls back to "any date"
+            field_re = COLUMN_FIELD_AFTER_DATE_RE if date_assigned else COLUMN_FIELD_RE
+            match = field_re.match(col)
+            if not match:
+                continue
+            field = match.lastgroup
+            if field in ("NoticeDate", "AnyDate"):
+                field = "Date"
+                date_assigned = True
+            column_mapping[col_index] = field
         logger.info(f"Mapped columns: {column_mapping}")
 
+        # Several columns can match one field; the leftmost wins
+        field_index = {}
+        for col_index, field in column_mapping.items():
+            field_index.setdefault(field, col_index)
+
         # Ensure required columns exist
-        if "Company" not in df.columns and len(df.columns) > 0:
-            df = df.rename(columns={df.columns[0]: "Company"})
+        field_index.setdefault("Company", 0)
+
+        company_index = field_index["Company"]
+        date_index = field_index.get("Date")
+        employees_index = field_index.get("Employees")
 
-        if "Date" not in df.columns:
-            for col in df.columns:
-                if "date" in str(col).lower():
-                    df = df.rename(columns={col: "Date"})
-                    break
+        # Loop invariants, bound once for the row loop
+        append = notices.append
+        placeholder_date = f"{year_used}-01-01"
 
         # Process ALL records (no date filtering)
-        for idx, row in df.iterrows():
+        for idx, tr in enumerate(rows):
             try:
-                # Use column indexing to avoid Series ambiguity
-                company = ""
-                if "Company" in df.columns:
-                    val = row["Company"]
-                    company = str(val.iloc[0] if hasattr(val, 'iloc') else val).strip()
+                cells = [table_cell_text(cell) for cell in tr.iterchildren("td", "th")]
+                if not cells:
+                    continue
 
-                if not company or company.lower() == "nan":
+                company = cells[company_index] if company_index < len(cells) else ""
+                if not company:
                     continue
 
                 date_val = None
-                if "Date" in df.columns:
-                    val = row["Date"]
-                    date_val = val.iloc[0] if hasattr(val, 'iloc') else val
+                if date_index is not None and date_index < len(cells):
+                    date_val = cells[date_index]
 
-                date_filed = parse_date(date_val)
-                if not date_filed:
-                    # Use a placeholder date if parsing fails
-                    date_filed = f"{year_used}-01-01"
+                # Use a placeholder date if parsing fails
+                date_filed = parse_date(date_val) or placeholder_date
 
                 emp_val = 0
-                if "Employees" in df.columns:
-                    val = row["Employees"]
-                    emp_val = val.iloc[0] if hasattr(val, 'iloc') else val
+                if employees_index is not None and employees_index < len(cells):
+                    emp_val = cells[employees_index]
 
                 employees = parse_employees(emp_val)
 
-                notice = {
+                append({
                     "company": company,
                     "state": "NY",
                     "employees": employees,
                     "date_filed": date_filed
-                }
-                notices.append(notice)
+                })
 
             except Exception as e:
                 logger.warning(f"Failed to parse row {idx}: {e}")
@@ -253,10 +445,12 @@ def scrape_ny_warn_notices():
 
         logger.info(f"Scraped {len(notices)} NY WARN notices from {year_used} archive")
 
+        # Only a page that yielded notices may be skipped next time
+        if notices:
+            remember_validators(url, response)
+
     except requests.RequestException as e:
         logger.error(f"Failed to fetch NY WARN page: {e}")
-    except ValueError as e:
-        logger.error(f"No tables found on NY WARN page: {e}")
     except Exception as e:
         logger.error(f"Failed to parse NY WARN page: {e}")
 
@@ -309,15 +503,14 @@ def run_scraper():
         # Get WARN notices from real sources
         notices = scrape_warn_sites()
 
-        # Save to database
+        # Save to database with one executemany in a single transaction
         saved_count = 0
-        for notice in notices:
-            try:
-                save_warn(notice)
-                saved_count += 1
-                logger.info(f"Saved WARN: {notice['company']} ({notice['state']})")
-            except Exception as e:
-                logger.error(f"Failed to save WARN {notice.get('company')}: {e}")
+        try:
+            inserted = save_warns_bulk(notices)
+            saved_count = len(notices)
+            logger.info(f"Saved {saved_count} WARN notices ({inserted} new, {saved_count - inserted} already stored)")
+        except Exception as e:
+            logger.error(f"Failed to save {len(notices)} WARN notices: {e}")
 
         logger.info(f"WARN scraper completed: {saved_count}/{len(notices)} records saved")
         return saved_count
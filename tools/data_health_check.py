@@ -156,82 +156,79 @@ def content_quality_check(cursor):
         log_check(False, "No BDC loan data available", is_warning=True)
 
 
+def duplicate_and_junk_counts(cursor, table, name_col, key_cols):
+    """Count duplicate key groups and junk names in a single table scan.
+
+    The name column is part of the key, so grouping by the key also lets
+    each group count its null/empty/"nan" names.
+
+    Args:
+        cursor: SQLite cursor.
+        table: Table name.
+        name_col: Column holding the entity name.
+        key_cols: Columns that should be unique together.
+
+    Returns:
+        Tuple of (duplicate key combinations, records with invalid names).
+    """
+    cursor.execute(f"""
+        SELECT COALESCE(SUM(cnt > 1), 0), COALESCE(SUM(junk), 0)
+        FROM (
+            SELECT COUNT(*) AS cnt,
+                   SUM({name_col} IS NULL OR TRIM({name_col}) = ''
+                       OR LOWER({name_col}) = 'nan') AS junk
+            FROM {table}
+            GROUP BY {", ".join(key_cols)}
+        )
+    """)
+    return cursor.fetchone()
+
+
 def business_logic_check(cursor):
     """Check for duplicates and data junk."""
     print("\n" + "=" * 60)
     print("4. BUSINESS LOGIC VALIDATION")
     print("=" * 60)
 
+    # One grouped scan per table yields both its duplicate and junk counts
+    warn_dups, warn_junk = duplicate_and_junk_counts(
+        cursor, "warn_notices", "company", ("company", "date_filed"))
+    legal_dups, legal_junk = duplicate_and_junk_counts(
+        cursor, "legal_cases", "defendant", ("defendant", "date_filed"))
+    bdc_dups, bdc_junk = duplicate_and_junk_counts(
+        cursor, "bdc_loans", "borrower", ("borrower", "fund", "date_added"))
+
     # Check for duplicates (using unique constraints, these shouldn't exist)
     print("\n  [Duplicate Check]")
 
-    # WARN duplicates
-    cursor.execute("""
-        SELECT company, date_filed, COUNT(*) as cnt
-        FROM warn_notices
-        GROUP BY company, date_filed
-        HAVING cnt > 1
-    """)
-    warn_dups = cursor.fetchall()
     if warn_dups:
-        log_check(False, f"WARN: {len(warn_dups)} duplicate company+date combinations")
+        log_check(False, f"WARN: {warn_dups} duplicate company+date combinations")
     else:
         log_check(True, "WARN: No duplicates detected")
 
-    # Legal duplicates
-    cursor.execute("""
-        SELECT defendant, date_filed, COUNT(*) as cnt
-        FROM legal_cases
-        GROUP BY defendant, date_filed
-        HAVING cnt > 1
-    """)
-    legal_dups = cursor.fetchall()
     if legal_dups:
-        log_check(False, f"Legal: {len(legal_dups)} duplicate defendant+date combinations")
+        log_check(False, f"Legal: {legal_dups} duplicate defendant+date combinations")
     else:
         log_check(True, "Legal: No duplicates detected")
 
-    # BDC duplicates
-    cursor.execute("""
-        SELECT borrower, fund, date_added, COUNT(*) as cnt
-        FROM bdc_loans
-        GROUP BY borrower, fund, date_added
-        HAVING cnt > 1
-    """)
-    bdc_dups = cursor.fetchall()
     if bdc_dups:
-        log_check(False, f"BDC: {len(bdc_dups)} duplicate borrower+fund+date combinations")
+        log_check(False, f"BDC: {bdc_dups} duplicate borrower+fund+date combinations")
     else:
         log_check(True, "BDC: No duplicates detected")
 
     # Check for data junk (null/empty/nan company names)
     print("\n  [Data Junk Check]")
 
-    cursor.execute("""
-        SELECT COUNT(*) FROM warn_notices
-        WHERE company IS NULL OR TRIM(company) = '' OR LOWER(company) = 'nan'
-    """)
-    warn_junk = cursor.fetchone()[0]
     if warn_junk > 0:
         log_check(False, f"WARN: {warn_junk} records with invalid company names")
     else:
         log_check(True, "WARN: All company names are valid")
 
-    cursor.execute("""
-        SELECT COUNT(*) FROM legal_cases
-        WHERE defendant IS NULL OR TRIM(defendant) = '' OR LOWER(defendant) = 'nan'
-    """)
-    legal_junk = cursor.fetchone()[0]
     if legal_junk > 0:
         log_check(False, f"Legal: {legal_junk} records with invalid defendant names")
     else:
         log_check(True, "Legal: All defendant names are valid")
 
-    cursor.execute("""
-        SELECT COUNT(*) FROM bdc_loans
-        WHERE borrower IS NULL OR TRIM(borrower) = '' OR LOWER(borrower) = 'nan'
-    """)
-    bdc_junk = cursor.fetchone()[0]
     if bdc_junk > 0:
         log_check(False, f"BDC: {bdc_junk} records with invalid borrower names")
     else: